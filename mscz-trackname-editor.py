@@ -26,9 +26,18 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
 
 import zipfile
-import xml.etree.ElementTree as ET
+import re
+import collections
+import copy
+import struct
+import zlib
+import time
+import html
+from xml.sax.saxutils import escape
 import tempfile
 import os
+import sys
+import platform
 import shutil
 import customtkinter as ctk
 from tkinter import messagebox
@@ -42,29 +51,15 @@ try:
 except ImportError:
     TKINTERDND2_AVAILABLE = False
 
-# Application Info
-VERSION = "1.1"
-LAST_MODIFIED = "2025-10-31"
-LICENSE = "GPLv3"
-AUTHOR = "Diego Denolf (graffesmusic)"
-
-
-import zipfile
-import xml.etree.ElementTree as ET
-import tempfile
-import os
-import shutil
-import customtkinter as ctk
-from tkinter import messagebox
-import tkinter as tk  
-import threading
-
-# Try to import tkinterdnd2 for better Windows drag/drop
+# Try to import libdeflate bindings for smaller rewritten .mscx entries
 try:
-    from tkinterdnd2 import DND_FILES, TkinterDnD
-    TKINTERDND2_AVAILABLE = True
+    import deflate
+    DEFLATE_AVAILABLE = True
 except ImportError:
-    TKINTERDND2_AVAILABLE = False
+    DEFLATE_AVAILABLE = False
+
+# Host OS, looked up once
+SYSTEM = platform.system()
 
 # Application Info
 VERSION = "1.1"
@@ -72,7 +67,70 @@ LAST_MODIFIED = "2025-10-31"
 LICENSE = "GPLv3"
 AUTHOR = "Diego Denolf (graffesmusic)"
 
+def write_precompressed_zip_entry(target, info, chunks):
+    """Append an entry whose data is already compressed (CRC and sizes set in info)"""
+    # Sizes and CRC are known, so write them in the local header itself
+    # rather than in a trailing data descriptor
+    new_info = copy.copy(info)
+    new_info.flag_bits &= ~0x08
+    target.fp.seek(target.start_dir)
+    new_info.header_offset = target.fp.tell()
+    target.fp.write(new_info.FileHeader())
+    for chunk in chunks:
+        target.fp.write(chunk)
+    
+    # Register the entry so it ends up in the central directory
+    target.filelist.append(new_info)
+    target.NameToInfo[new_info.filename] = new_info
+    target.start_dir = target.fp.tell()
+    target._didModify = True
+
+def copy_zip_entry_raw(source, target, info):
+    """Copy a zip entry's compressed bytes into another archive without recompressing"""
+    # Locate the data behind the entry's local file header
+    source.fp.seek(info.header_offset)
+    header = struct.unpack(zipfile.structFileHeader, source.fp.read(zipfile.sizeFileHeader))
+    if header[0] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile(f"Bad local file header for {info.filename}")
+    source.fp.seek(header[10] + header[11], os.SEEK_CUR)  # file name + extra field
+    
+    def read_chunks():
+        remaining = info.compress_size
+        while remaining:
+            chunk = source.fp.read(min(remaining, 1 << 20))
+            if not chunk:
+                raise zipfile.BadZipFile(f"Truncated data for {info.filename}")
+            yield chunk
+            remaining -= len(chunk)
+    
+    write_precompressed_zip_entry(target, info, read_chunks())
+
+def splice(data, edits):
+    """Yield slices of data with each (start, end, replacement) edit applied"""
+    pos = 0
+    for start, end, replacement in edits:
+        yield data[pos:start]
+        yield replacement
+        pos = end
+    yield data[pos:]
+
 class PartNameEditor:
+    # Matches a Part's opening tag up to its <trackName> text without running
+    # past the end of that Part. Groups: prefix, part id, name, closing tag
+    _TRACK_NAME_RE = re.compile(
+        rb'(<Part\b[^>]*\bid="([^"]+)"[^>]*>(?:(?!</Part>).)*?<trackName>)([^<]*)(</trackName>)',
+        re.DOTALL)
+    
+    # Dropped file paths that look like MuseScore files
+    _MSCZ_PATH_RE = re.compile(r'\.mscz\Z', re.IGNORECASE)
+    
+    # Used when loading: a whole <Part> element (attributes, body), the start
+    # of one, and the id / first trackName inside it
+    _PART_RE = re.compile(rb'\s*<Part\b([^>]*)>(.*?)</Part>', re.DOTALL)
+    _PART_START_RE = re.compile(rb'<Part[\s>]')
+    _PART_ID_RE = re.compile(rb'\bid="([^"]*)"')
+    _PART_TRACK_NAME_RE = re.compile(rb'<trackName>([^<]*)</trackName>')
+
     def __init__(self, root):
         self.root = root  # Use the provided root window
         
@@ -91,7 +149,11 @@ class PartNameEditor:
         # Store file data separately from UI
         self.current_file = None
         self.parts_data = []
-        self.original_parts_data = []
+        self.original_parts_data = []  # Original track names, by index
+        self.parts_by_iid = {}  # Treeview item ID -> part data
+        self.dirty_parts = {}  # Row index -> part data, for parts with a pending rename
+        self.loading = False
+        self.load_id = 0  # Incremented per load so stale results can be dropped
         
         # Create the UI
         self.create_ui()
@@ -127,19 +189,15 @@ class PartNameEditor:
     def on_drop(self, event):
         """Handle file drop event"""
         try:
-            # Get the dropped files
-            files = event.data.split()
+            # Get the dropped files (a Tcl list; paths with spaces come in braces)
+            files = self.root.tk.splitlist(event.data)
             mscz_found = False
             
             for file_path in files:
-                # Clean the file path
-                clean_path = file_path.strip()
-                if clean_path.startswith('{') and clean_path.endswith('}'):
-                    clean_path = clean_path[1:-1]
-                
-                # Check if it's a .mscz file that exists
-                if clean_path.lower().endswith('.mscz') and os.path.exists(clean_path):
-                    self.root.after(0, lambda path=clean_path: self.load_file_from_path(path))
+                # Check if it's a .mscz file; a missing or unreadable file is
+                # reported by load_parts when it fails to open it
+                if self._MSCZ_PATH_RE.search(file_path):
+                    self.root.after(0, lambda path=file_path: self.load_file_from_path(path))
                     mscz_found = True
                     break  # Use first valid .mscz file
             
@@ -178,10 +236,14 @@ class PartNameEditor:
 
     def has_unsaved_changes(self):
         """Check if there are unsaved changes in the current file"""
-        return any(
-            part['new_name'] != part['current_name'] 
-            for part in self.parts_data
-        ) 
+        return bool(self.dirty_parts)
+    
+    def update_dirty(self, part_data):
+        """Record whether a part's new name differs from its current name"""
+        if part_data['new_name'] != part_data['current_name']:
+            self.dirty_parts[part_data['index']] = part_data
+        else:
+            self.dirty_parts.pop(part_data['index'], None)
         
 
     def create_ui(self):
@@ -205,10 +267,13 @@ class PartNameEditor:
         file_btn_frame = ctk.CTkFrame(file_frame, fg_color="transparent")
         file_btn_frame.pack(fill="x", pady=5)
         
-        ctk.CTkButton(file_btn_frame, text="Open .mscz File", 
-                     command=self.open_file, width=140).pack(side="left", padx=5)
-        ctk.CTkButton(file_btn_frame, text="Reload", 
-                     command=self.load_parts, width=80).pack(side="left", padx=5)
+        button_state = "disabled" if self.loading else "normal"
+        self.open_button = ctk.CTkButton(file_btn_frame, text="Open .mscz File", 
+                                        command=self.open_file, width=140, state=button_state)
+        self.open_button.pack(side="left", padx=5)
+        self.reload_button = ctk.CTkButton(file_btn_frame, text="Reload", 
+                                          command=self.load_parts, width=80, state=button_state)
+        self.reload_button.pack(side="left", padx=5)
         
         #self.file_label = ctk.CTkLabel(file_frame, text="No file selected", 
         #                              text_color="gray", wraplength=500)
@@ -218,8 +283,7 @@ class PartNameEditor:
         if self.current_file:
             file_display_text = os.path.basename(self.current_file)
         else:
-            import platform
-            if platform.system() == "Linux":
+            if SYSTEM == "Linux":
                 file_display_text = "No file selected (drag a .mscz file here might not work on your system)"
             else:
                 file_display_text = "No file selected (or drag a .mscz file here)"
@@ -424,18 +488,20 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
         about_dialog.bind('<Escape>', lambda e: about_dialog.destroy())
 
     def reload_parts_tree(self):
-        """Reload parts data into the treeview after UI recreation"""
+        """Reload parts data into the treeview"""
         # Clear existing data
-        for item in self.parts_tree.get_children():
-            self.parts_tree.delete(item)
+        self.parts_tree.delete(*self.parts_tree.get_children())
         
         # Reload parts data
+        self.parts_by_iid = {}
         for part_data in self.parts_data:
-            self.parts_tree.insert("", "end", values=(
+            iid = self.parts_tree.insert("", "end", values=(
                 part_data['id'], 
                 part_data['current_name'], 
                 part_data['new_name']
             ))
+            part_data['iid'] = iid
+            self.parts_by_iid[iid] = part_data
 
     def change_theme(self, choice):
         """Change color theme by recreating the UI"""
@@ -451,10 +517,10 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
         """Change appearance mode (light/dark)"""
         if choice != self.current_mode:
             self.current_mode = choice
+            # CTk widgets follow the new mode by themselves; only the
+            # ttk Treeview needs restyling, so the UI is not rebuilt
             ctk.set_appearance_mode(choice)
-            # Update treeview and recreate UI
             self.update_treeview_style()
-            self.create_ui()
     
     def update_treeview_style(self):
         """Update treeview colors to match current appearance mode"""
@@ -480,12 +546,7 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
     def exit_app(self):
         """Exit the application with confirmation if there are unsaved changes"""
         # Check if there are unsaved changes
-        changes_made = any(
-            part['new_name'] != part['current_name'] 
-            for part in self.parts_data
-        )
-        
-        if changes_made:
+        if self.has_unsaved_changes():
             response = messagebox.askyesnocancel(
                 "Unsaved Changes", 
                 "You have unsaved changes. Do you want to save before exiting?\n\n"
@@ -535,54 +596,122 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
             self.load_parts()
             
     def load_parts(self):
-        """Extract part names from the .mscz file"""
+        """Extract part names from the .mscz file on a background thread"""
         if not self.current_file:
             messagebox.showwarning("Warning", "No file selected")
             return
-            
+        
+        # Clear existing data right away so nothing can be edited or saved
+        # against the previous file while the new one loads
+        self.parts_data = []
+        self.original_parts_data = []
+        self.dirty_parts = {}
+        self.reload_parts_tree()
+        
+        # Newer loads supersede older ones still running
+        self.load_id += 1
+        self.set_loading(True)
+        threading.Thread(target=self._load_parts_worker,
+                         args=(self.load_id, self.current_file), daemon=True).start()
+    
+    def _load_parts_worker(self, load_id, file_path):
+        """Read (part ID, track name) pairs from the .mscz file, off the Tk main loop"""
         try:
-            with zipfile.ZipFile(self.current_file, 'r') as mscz:
+            with zipfile.ZipFile(file_path, 'r') as mscz:
                 # Find the .mscx file inside
                 mscx_files = [f for f in mscz.namelist() if f.endswith('.mscx')]
                 if not mscx_files:
-                    messagebox.showerror("Error", "No .mscx file found in the .mscz archive")
+                    self.root.after(0, self._load_parts_failed, load_id,
+                                    "No .mscx file found in the .mscz archive")
                     return
                     
                 with mscz.open(mscx_files[0]) as mscx_file:
-                    tree = ET.parse(mscx_file)
-                    root = tree.getroot()
-                    
-                    # Clear existing data
-                    for item in self.parts_tree.get_children():
-                        self.parts_tree.delete(item)
-                    self.parts_data = []
-                    self.original_parts_data = []
-                    
-                    # Find all parts
-                    for part in root.findall('.//Part'):
-                        part_id = part.get('id', 'Unknown')
-                        track_name_elem = part.find('trackName')
-                        track_name = track_name_elem.text if track_name_elem is not None else "Unknown"
-                        
-                        # Store part data
-                        part_data = {
-                            'element': part,
-                            'id': part_id,
-                            'current_name': track_name,
-                            'new_name': track_name
-                        }
-                        self.parts_data.append(part_data)
-                        self.original_parts_data.append(part_data.copy())
-                        
-                        # Add to treeview
-                        self.parts_tree.insert("", "end", values=(
-                            part_id, track_name, track_name
-                        ))
+                    parts = self.read_parts(mscx_file)
                         
-            messagebox.showinfo("Success", f"Loaded {len(self.parts_data)} parts from file")
+            self.root.after(0, self._apply_parts_result, load_id, parts)
             
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to load file:\n{str(e)}")
+            self.root.after(0, self._load_parts_failed, load_id, f"Failed to load file:\n{str(e)}")
+    
+    def read_parts(self, mscx_file, chunk_size=1 << 16):
+        """Return (part ID, track name) pairs for the top-level Parts of a .mscx stream"""
+        # Only Part ids and names are needed, so match them with regexes
+        # instead of building an XML tree. MuseScore writes the Parts as
+        # consecutive siblings before the <Staff> bodies, so decompression
+        # stops at the first tag after the last Part.
+        data = bytearray()
+        parts = []
+        pos = 0
+        while True:
+            if parts:
+                match = self._PART_RE.match(data, pos)
+            else:
+                match = self._PART_RE.search(data, pos)
+            
+            if match:
+                id_match = self._PART_ID_RE.search(match.group(1))
+                name_match = self._PART_TRACK_NAME_RE.search(match.group(2))
+                part_id = id_match.group(1).decode('utf-8') if id_match else 'Unknown'
+                if name_match:
+                    # Scores often repeat names (16 x "Violin"); share one string
+                    track_name = sys.intern(html.unescape(name_match.group(1).decode('utf-8')))
+                else:
+                    track_name = "Unknown"
+                parts.append((part_id, track_name))
+                pos = match.end()
+                continue
+            
+            if parts:
+                ahead = bytes(data[pos:pos + 64]).lstrip()
+                if len(ahead) >= 6 and not self._PART_START_RE.match(ahead):
+                    break  # A different element follows the last Part
+            else:
+                # Resume the search at an unfinished Part, or near the end
+                start = self._PART_START_RE.search(data, pos)
+                pos = start.start() if start else max(pos, len(data) - 6)
+            
+            chunk = mscx_file.read(chunk_size)
+            if not chunk:
+                break
+            data += chunk
+        
+        return parts
+    
+    def _apply_parts_result(self, load_id, parts):
+        """Show the parts read by _load_parts_worker (runs on the Tk main loop)"""
+        if load_id != self.load_id:
+            return  # A newer load is in progress
+        
+        for index, (part_id, track_name) in enumerate(parts):
+            # Store part data; ids repeat (MuseScore 3 Parts have none), so
+            # pending renames are tracked by row index
+            self.parts_data.append({
+                'index': index,
+                'id': part_id,
+                'current_name': track_name,
+                'new_name': track_name
+            })
+            self.original_parts_data.append(track_name)
+        
+        # Add all rows to the treeview at once
+        self.reload_parts_tree()
+        self.set_loading(False)
+        messagebox.showinfo("Success", f"Loaded {len(self.parts_data)} parts from file")
+    
+    def _load_parts_failed(self, load_id, message):
+        """Report a load error from _load_parts_worker (runs on the Tk main loop)"""
+        if load_id != self.load_id:
+            return  # A newer load is in progress
+        
+        self.set_loading(False)
+        messagebox.showerror("Error", message)
+    
+    def set_loading(self, loading):
+        """Disable the Open and Reload buttons while a file is loading"""
+        self.loading = loading
+        state = "disabled" if loading else "normal"
+        self.open_button.configure(state=state)
+        self.reload_button.configure(state=state)
             
     def on_double_click(self, event):
         """Handle double-click to edit part name"""
@@ -591,8 +720,8 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
             self.edit_part_name(item[0])
             
     def edit_part_name(self, item):
-        current_values = self.parts_tree.item(item, 'values')
-        if not current_values:
+        part_data = self.parts_by_iid.get(item)
+        if part_data is None:
             return
             
         # Create edit dialog using CustomTkinter
@@ -605,17 +734,17 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
         edit_dialog.focus_set()
         edit_dialog.lift()  # Bring to front
         
-        ctk.CTkLabel(edit_dialog, text=f"Editing Part {current_values[0]}", 
+        ctk.CTkLabel(edit_dialog, text=f"Editing Part {part_data['id']}", 
                     font=ctk.CTkFont(weight="bold", size=14)).pack(pady=15)
         
         ctk.CTkLabel(edit_dialog, text="Current name:").pack()
-        ctk.CTkLabel(edit_dialog, text=current_values[1], 
+        ctk.CTkLabel(edit_dialog, text=part_data['current_name'] or "", 
                     text_color="#1f6aa5").pack()
         
         ctk.CTkLabel(edit_dialog, text="New name:").pack(pady=(15, 0))
         name_entry = ctk.CTkEntry(edit_dialog, width=300, placeholder_text="Enter new part name")
         name_entry.pack(pady=10)
-        name_entry.insert(0, current_values[2])
+        name_entry.insert(0, part_data['new_name'] or "")
         name_entry.select_range(0, tk.END)
         name_entry.focus()
         
@@ -625,8 +754,8 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
                 # Update treeview
                 self.parts_tree.set(item, "New Name", new_name)
                 # Update data
-                index = self.parts_tree.index(item)
-                self.parts_data[index]['new_name'] = new_name
+                part_data['new_name'] = new_name
+                self.update_dirty(part_data)
             edit_dialog.destroy()
             
         def cancel_edit():
@@ -649,35 +778,27 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
 
     def add_numbers(self):
         """Add numbers to parts with the same name"""
-        name_count = {}
-        name_first_occurrence = {}
         changes_made = False
         
-        # First pass: count occurrences and track first occurrence
-        for i, part_data in enumerate(self.parts_data):
-            current_name = part_data['current_name']
-            if current_name in name_count:
-                name_count[current_name] += 1
-            else:
-                name_count[current_name] = 1
-                name_first_occurrence[current_name] = i
+        # First pass: count occurrences
+        name_count = collections.Counter(part_data['current_name'] for part_data in self.parts_data)
         
         # Second pass: apply numbering
-        for i, part_data in enumerate(self.parts_data):
+        seen = collections.defaultdict(int)
+        for part_data in self.parts_data:
             current_name = part_data['current_name']
             if name_count[current_name] > 1:  # Only number if there are duplicates
-                # Find position in the sequence
-                same_name_parts = [j for j, p in enumerate(self.parts_data) 
-                                 if p['current_name'] == current_name]
-                position = same_name_parts.index(i) + 1  # 1-based numbering
+                # Position in the sequence of parts sharing this name
+                seen[current_name] += 1
+                position = seen[current_name]  # 1-based numbering
                 
                 new_name = f"{current_name} {position}"
                 
                 # Update data
-                self.parts_data[i]['new_name'] = new_name
+                part_data['new_name'] = new_name
+                self.update_dirty(part_data)
                 # Update treeview
-                item = self.parts_tree.get_children()[i]
-                self.parts_tree.set(item, "New Name", new_name)
+                self.parts_tree.set(part_data['iid'], "New Name", new_name)
                 changes_made = True
                     
         if changes_made:
@@ -690,11 +811,27 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
         if not messagebox.askyesno("Confirm", "Reset all part names to their original values?"):
             return
             
-        for i, original_data in enumerate(self.original_parts_data):
-            self.parts_data[i]['new_name'] = original_data['current_name']
-            item = self.parts_tree.get_children()[i]
-            self.parts_tree.set(item, "New Name", original_data['current_name'])
+        for part_data, original_name in zip(self.parts_data, self.original_parts_data):
+            part_data['new_name'] = original_name
+            self.update_dirty(part_data)
+            self.parts_tree.set(part_data['iid'], "New Name", original_name)
             
+    def settle_dirty_parts(self, found_ids):
+        """Clear the pending changes once the file holds them; returns the ids of parts without a trackName"""
+        missing_ids = []
+        for part_data in self.dirty_parts.values():
+            if part_data['id'].encode('utf-8') in found_ids:
+                # The file now has the new name, so it becomes the current one
+                part_data['current_name'] = part_data['new_name']
+                self.parts_tree.set(part_data['iid'], "Current Name", part_data['current_name'])
+            else:
+                # Nothing in the file to rename, so drop the edit
+                part_data['new_name'] = part_data['current_name']
+                self.parts_tree.set(part_data['iid'], "New Name", part_data['new_name'])
+                missing_ids.append(part_data['id'])
+        self.dirty_parts = {}
+        return missing_ids
+        
     def save_file(self):
         """Save changes back to the .mscz file"""
         if not self.current_file:
@@ -702,81 +839,155 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
             return
             
         # Check if any changes were made
-        changes_made = any(
-            part['new_name'] != part['current_name'] 
-            for part in self.parts_data
-        )
-        
-        if not changes_made:
+        if not self.dirty_parts:
             messagebox.showinfo("Info", "No changes to save")
             return
             
         try:
-            # Count changes BEFORE saving (so we can show the correct count)
-            num_changes = sum(1 for p in self.parts_data if p['new_name'] != p['current_name'])
+            # New names by part id, already XML-escaped for splicing into the raw bytes
+            changed_by_id = {
+                p['id'].encode('utf-8'): escape(p['new_name']).encode('utf-8')
+                for p in self.dirty_parts.values()
+            }
             
-            # Create backup filename
-            backup_file = self.current_file.replace('.mscz', '_backup.mscz')
-            counter = 1
-            while os.path.exists(backup_file):
-                backup_file = self.current_file.replace('.mscz', f'_backup_{counter}.mscz')
-                counter += 1
+            # Locate every trackName to rewrite up front, so a save that would
+            # not touch the file skips the backup and the rewrite entirely
+            pending_edits = {}  # .mscx name -> (document bytes, [(start, end, new name)])
+            found_ids = set()  # changed part ids with a trackName somewhere in the file
+            edited_ids = set()  # ... and those whose trackName actually differs
+            with zipfile.ZipFile(self.current_file, 'r') as original:
+                for item in original.infolist():
+                    # Encrypted entries can't be read or copied without a password,
+                    # so refuse before anything (the backup included) is written
+                    if item.flag_bits & 0x01:
+                        messagebox.showerror("Error",
+                            f"Cannot save: {item.filename} is encrypted in this file")
+                        return
+                    if not item.filename.endswith('.mscx'):
+                        continue
+                    data = memoryview(original.read(item.filename))
+                    edits = []
+                    for match in self._TRACK_NAME_RE.finditer(data):
+                        new_name = changed_by_id.get(match.group(2))
+                        if new_name is not None:
+                            found_ids.add(match.group(2))
+                        # The file may already hold the new name (e.g. an excerpt
+                        # renamed earlier), so only record real differences
+                        if new_name is not None and match.group(3) != new_name:
+                            edits.append((match.start(3), match.end(3), new_name))
+                            edited_ids.add(match.group(2))
+                    if edits:
+                        pending_edits[item.filename] = (data, edits)
+            
+            # Parts the save actually rewrites, for the summary message
+            num_changes = len(edited_ids)
+            
+            if not pending_edits:
+                missing_ids = self.settle_dirty_parts(found_ids)
+                if missing_ids:
+                    messagebox.showwarning("Warning",
+                        f"No trackName could be found for part(s) {', '.join(missing_ids)}, "
+                        f"so their names were not changed")
+                else:
+                    messagebox.showinfo("Info", "No changes to save")
+                return
             
-            # Create backup first
-            shutil.copy2(self.current_file, backup_file)
+            # Create backup filename, falling back to a timestamped one and then a
+            # counter, so saves within the same second never reuse a backup name
+            base, ext = os.path.splitext(self.current_file)
+            stamp = int(time.time())
+            counter = 0
+            while True:
+                if counter == 0:
+                    backup_file = f"{base}_backup{ext}"
+                elif counter == 1:
+                    backup_file = f"{base}_backup_{stamp}{ext}"
+                else:
+                    backup_file = f"{base}_backup_{stamp}_{counter - 1}{ext}"
+                counter += 1
+                
+                # Create backup first. The save writes a new file and renames it over
+                # the original, so a hard link keeps the old contents without copying
+                # any data; fall back to a real copy (sendfile on Linux) where links
+                # aren't supported. Both create the name exclusively, so an existing
+                # backup is never overwritten and a taken name moves on to the next
+                try:
+                    os.link(self.current_file, backup_file)
+                except FileExistsError:
+                    continue
+                except OSError:
+                    try:
+                        open(backup_file, 'xb').close()
+                    except FileExistsError:
+                        continue
+                    try:
+                        shutil.copyfile(self.current_file, backup_file)
+                    except Exception:
+                        # Don't leave the claimed name behind as an empty backup
+                        os.unlink(backup_file)
+                        raise
+                break
             
-            # Create temporary working directory
-            temp_dir = tempfile.mkdtemp()
+            # Create the temporary file next to the original, on the same filesystem,
+            # so it can be swapped in with an atomic rename
+            temp_file = tempfile.NamedTemporaryFile(
+                dir=os.path.dirname(os.path.abspath(self.current_file)),
+                suffix='.mscz', delete=False, buffering=1 << 20)
             
             try:
                 with zipfile.ZipFile(self.current_file, 'r') as original:
-                    # Use the same compression as original files for consistent file sizes
-                    with zipfile.ZipFile(os.path.join(temp_dir, "modified.mscz"), 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=6) as modified:
+                    # Use the same compression as original files for consistent file sizes;
+                    # entries keep their own compress_type, and output goes through a 1 MiB buffer
+                    with temp_file, \
+                            zipfile.ZipFile(temp_file, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=6, allowZip64=True) as modified:
                         # Copy all files, modifying the .mscx
                         for item in original.infolist():
-                            if item.filename.endswith('.mscx'):
-                                # Modify the .mscx file
-                                with original.open(item.filename) as mscx_file:
-                                    tree = ET.parse(mscx_file)
-                                    root = tree.getroot()
-                                    
-                                    # Update part names
-                                    for part in root.findall('.//Part'):
-                                        part_id = part.get('id')
-                                        for part_data in self.parts_data:
-                                            if part_data['id'] == part_id and part_data['new_name'] != part_data['current_name']:
-                                                track_name_elem = part.find('trackName')
-                                                if track_name_elem is not None:
-                                                    track_name_elem.text = part_data['new_name']
-                                                    #print(f"Changed part {part_id}: '{part_data['current_name']}' → '{part_data['new_name']}'")
-                                    
-                                    # Write modified content
-                                    modified.writestr(item.filename, ET.tostring(root, encoding='unicode'))
+                            if item.filename in pending_edits:
+                                # Splice the new names into the .mscx text, leaving
+                                # the rest of the document byte-for-byte unchanged
+                                data, edits = pending_edits[item.filename]
+                                if DEFLATE_AVAILABLE:
+                                    # libdeflate's level 12 beats zlib -9 on size and is
+                                    # still quick on a text document this small
+                                    new_data = b''.join(splice(data, edits))
+                                    compressed = deflate.deflate_compress(new_data, 12)
+                                    new_info = copy.copy(item)
+                                    new_info.compress_type = zipfile.ZIP_DEFLATED
+                                    new_info.extract_version = max(new_info.extract_version, 20)  # 2.0: deflate
+                                    new_info.CRC = zlib.crc32(new_data)
+                                    new_info.file_size = len(new_data)
+                                    new_info.compress_size = len(compressed)
+                                    write_precompressed_zip_entry(modified, new_info, [compressed])
+                                else:
+                                    # Slices stream straight into the compressor, so the
+                                    # rewritten document is never held in memory as a whole
+                                    with modified.open(item, 'w') as mscx_out:
+                                        for piece in splice(data, edits):
+                                            mscx_out.write(piece)
                             else:
-                                # Copy other files as-is
-                                modified.writestr(item, original.read(item.filename))
-                
-                # Replace original file with modified one
-                os.remove(self.current_file)
-                shutil.move(os.path.join(temp_dir, "modified.mscz"), self.current_file)
+                                # Copy other files (and untouched .mscx) as-is, still compressed
+                                copy_zip_entry_raw(original, modified, item)
                 
-                # Update current names to reflect the changes (AFTER showing the message)
-                for part_data in self.parts_data:
-                    part_data['current_name'] = part_data['new_name']
+                # Replace original file with modified one, keeping its permissions
+                shutil.copymode(self.current_file, temp_file.name)
+                os.replace(temp_file.name, self.current_file)
                 
-                # Also update the "Current Name" column in the treeview
-                for i, part_data in enumerate(self.parts_data):
-                    item = self.parts_tree.get_children()[i]
-                    self.parts_tree.set(item, "Current Name", part_data['current_name'])
+                # Update current names and the "Current Name" column, only for the
+                # parts that changed, including those the file already had right
+                missing_ids = self.settle_dirty_parts(found_ids)
                 
-                messagebox.showinfo("Success", 
-                    f"File saved successfully!\n\n"
+                message = (f"File saved successfully!\n\n"
                     f"Backup created as:\n{os.path.basename(backup_file)}\n\n"
                     f"Changes made: {num_changes} parts modified")
+                if missing_ids:
+                    message += f"\n\nNo trackName found for part(s): {', '.join(missing_ids)}"
+                messagebox.showinfo("Success", message)
                 
             finally:
-                # Cleanup temp directory
-                shutil.rmtree(temp_dir)
+                # Cleanup temp file if it was not moved into place
+                temp_file.close()
+                if os.path.exists(temp_file.name):
+                    os.unlink(temp_file.name)
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save file:\n{str(e)}")